@@ -1,9 +1,9 @@
 import dash
-from dash import dcc, html
-import plotly.express as px
-import pandas as pd
-import yfinance as yf
+from dash import dcc, html, Input, Output
 import datetime
+import os
+from types import SimpleNamespace
+from deferred import DeferredData, add_health_endpoint
 
 # Asset class definitions
 asset_classes = {
@@ -15,68 +15,96 @@ asset_classes = {
     'Cash': {'weight': 0.02, 'ticker': 'BIL'}
 }
 
-# Download price data
 start_date = datetime.datetime.now() - datetime.timedelta(days=365 * 5)
 end_date = datetime.datetime.now()
-price_data = pd.DataFrame()
 
-for asset, info in asset_classes.items():
-    data = yf.download(info['ticker'], start=start_date, end=end_date, auto_adjust=False, progress=False)
-    if 'Close' in data.columns:
-        price_data[asset] = data['Close']
 
-price_data.dropna(inplace=True)
+# Download and chart building run in a background thread so the server starts right away
+def build_dashboard_data():
+    import pandas as pd
+    import plotly.express as px
+    import yfinance as yf
 
-# If no data, raise error
-if price_data.empty:
-    raise Exception("No valid price data was loaded.")
+    # Download price data
+    price_data = pd.DataFrame()
 
-# Calculate returns and cumulative returns
-returns = price_data.pct_change().dropna()
-weights = [info['weight'] for info in asset_classes.values()]
-returns['Portfolio'] = returns.dot(weights)
-cumulative_returns = (1 + returns).cumprod()
+    for asset, info in asset_classes.items():
+        data = yf.download(info['ticker'], start=start_date, end=end_date, auto_adjust=False, progress=False)
+        if 'Close' in data.columns:
+            price_data[asset] = data['Close']
 
-# Annualized volatility
-volatility = returns.std() * (252 ** 0.5)
-volatility_text = [f"{asset}: {volatility[asset]:.2%}" for asset in asset_classes.keys()]
-volatility_text.append(f"Portfolio: {volatility['Portfolio']:.2%}")
+    price_data.dropna(inplace=True)
+
+    # If no data, raise error
+    if price_data.empty:
+        raise Exception("No valid price data was loaded.")
+
+    # Calculate returns and cumulative returns
+    returns = price_data.pct_change().dropna()
+    weights = [info['weight'] for info in asset_classes.values()]
+    returns['Portfolio'] = returns.dot(weights)
+    cumulative_returns = (1 + returns).cumprod()
+
+    # Annualized volatility
+    volatility = returns.std() * (252 ** 0.5)
+    volatility_text = [f"{asset}: {volatility[asset]:.2%}" for asset in asset_classes.keys()]
+    volatility_text.append(f"Portfolio: {volatility['Portfolio']:.2%}")
+
+    # Pie chart for asset allocation
+    pie_fig = px.pie(
+        names=list(asset_classes.keys()),
+        values=[v['weight'] for v in asset_classes.values()],
+        title="Global Market Portfolio Allocation",
+        hole=0.3
+    )
+
+    # Line chart for cumulative returns
+    line_fig = px.line(
+        cumulative_returns,
+        x=cumulative_returns.index,
+        y=cumulative_returns.columns,
+        title="Cumulative Returns Over 5 Years"
+    )
+
+    return SimpleNamespace(pie_fig=pie_fig, line_fig=line_fig, volatility_text=volatility_text)
+
+
+dashboard_data = DeferredData(build_dashboard_data, name="dashboard")
 
 # Initialize Dash app
 app = dash.Dash(__name__)
 app.title = "Global Market Portfolio Dashboard"
-
-# Pie chart for asset allocation
-pie_fig = px.pie(
-    names=list(asset_classes.keys()),
-    values=[v['weight'] for v in asset_classes.values()],
-    title="Global Market Portfolio Allocation",
-    hole=0.3
-)
-
-# Line chart for cumulative returns
-line_fig = px.line(
-    cumulative_returns,
-    x=cumulative_returns.index,
-    y=cumulative_returns.columns,
-    title="Cumulative Returns Over 5 Years"
-)
+add_health_endpoint(app, dashboard_data)
 
 # Dash layout
 app.layout = html.Div([
     html.H1("Global Market Portfolio Dashboard", style={"textAlign": "center"}),
 
     html.Div([
-        dcc.Graph(figure=pie_fig)
+        dcc.Loading(dcc.Graph(id='pie-chart'))
     ], style={"width": "50%", "display": "inline-block"}),
 
     html.Div([
-        dcc.Graph(figure=line_fig)
+        dcc.Loading(dcc.Graph(id='line-chart'))
     ], style={"width": "50%", "display": "inline-block"}),
 
     html.H3("Annualized Volatility (5Y)", style={"textAlign": "center", "marginTop": "30px"}),
-    html.Ul([html.Li(v) for v in volatility_text], style={"textAlign": "center", "fontSize": "18px"})
+    dcc.Loading(html.Ul(id='volatility-list', style={"textAlign": "center", "fontSize": "18px"}))
 ])
 
+
+# Fires once on page load and waits for the background build
+@app.callback(
+    Output('pie-chart', 'figure'),
+    Output('line-chart', 'figure'),
+    Output('volatility-list', 'children'),
+    Input('volatility-list', 'id')
+)
+def fill_dashboard(_):
+    data = dashboard_data.get()
+    return data.pie_fig, data.line_fig, [html.Li(v) for v in data.volatility_text]
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    # PORT set (Procfile dyno, benchmark cold start): bind it on all interfaces, without the reloader
+    port = os.environ.get('PORT')
+    app.run(debug=port is None, host='0.0.0.0' if port else '127.0.0.1', port=int(port or 8050))
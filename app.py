@@ -1,11 +1,11 @@
 import dash
 from dash import dcc, html, Input, Output, State
-import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
-import yfinance as yf
 import datetime
-import numpy as np
+import os
+from types import SimpleNamespace
+from deferred import DeferredData, add_health_endpoint
+from instrumentation import StartupTimer, instrument_app
 
 # === Asset Classes with ETF Tickers and Weights (market cap-based) ===
 asset_classes = {
@@ -20,38 +20,65 @@ asset_classes = {
 start_date = datetime.datetime.now() - datetime.timedelta(days=365 * 5)
 end_date = datetime.datetime.now()
 
-price_data = pd.DataFrame()
-etf_info = {}
-
-for label, info in asset_classes.items():
-    data = yf.download(info['ticker'], start=start_date, end=end_date, auto_adjust=True, progress=False)
-    if not data.empty and 'Close' in data.columns:
-        price_data[label] = data['Close']
-        etf_info[label] = {
-            'ticker': info['ticker'],
-            'price': round(data['Close'].iloc[-1], 2),
-            'return_5y': round((data['Close'].iloc[-1] / data['Close'].iloc[0]) - 1, 4),
-            'data': data['Close']
-        }
-
-price_data.dropna(inplace=True)
-returns = price_data.pct_change().dropna()
-weights = np.array([info['weight'] for info in asset_classes.values()])
-returns['Global Portfolio'] = returns.dot(weights)
-cumulative_returns = (1 + returns).cumprod()
-
-annualized_return = (cumulative_returns.iloc[-1]) ** (1 / 5) - 1
-annualized_volatility = returns.std() * np.sqrt(252)
-sharpe_ratio = annualized_return / annualized_volatility
-correlation_matrix = returns.corr()
-rolling_volatility = returns.rolling(window=90).std() * np.sqrt(252)
-
-cumulative_max = cumulative_returns.cummax()
-drawdowns = (cumulative_returns - cumulative_max) / cumulative_max
-max_drawdowns = drawdowns.min()
-
-app = dash.Dash(__name__)
+
+# === Data build: runs in a background thread so the server can bind its port right away ===
+def build_portfolio_data():
+    # Heavy imports live here, off the startup path
+    import numpy as np
+    import pandas as pd
+    import plotly.express  # noqa: F401 - warm the import used by the chart callbacks
+    import yfinance as yf
+
+    timer = StartupTimer()
+    price_data = pd.DataFrame()
+    etf_info = {}
+
+    for label, info in asset_classes.items():
+        data = yf.download(info['ticker'], start=start_date, end=end_date, auto_adjust=True, progress=False)
+        if not data.empty and 'Close' in data.columns:
+            price_data[label] = data['Close']
+            etf_info[label] = {
+                'ticker': info['ticker'],
+                'price': round(data['Close'].iloc[-1], 2),
+                'return_5y': round((data['Close'].iloc[-1] / data['Close'].iloc[0]) - 1, 4),
+                'data': data['Close']
+            }
+
+    timer.mark("download")
+
+    price_data.dropna(inplace=True)
+    returns = price_data.pct_change().dropna()
+    weights = np.array([info['weight'] for info in asset_classes.values()])
+    returns['Global Portfolio'] = returns.dot(weights)
+    cumulative_returns = (1 + returns).cumprod()
+
+    annualized_return = (cumulative_returns.iloc[-1]) ** (1 / 5) - 1
+    annualized_volatility = returns.std() * np.sqrt(252)
+    sharpe_ratio = annualized_return / annualized_volatility
+    correlation_matrix = returns.corr()
+    rolling_volatility = returns.rolling(window=90).std() * np.sqrt(252)
+
+    cumulative_max = cumulative_returns.cummax()
+    drawdowns = (cumulative_returns - cumulative_max) / cumulative_max
+    max_drawdowns = drawdowns.min()
+    timer.mark("analytics")
+
+    return SimpleNamespace(
+        etf_info=etf_info, cumulative_returns=cumulative_returns, annualized_return=annualized_return,
+        annualized_volatility=annualized_volatility, sharpe_ratio=sharpe_ratio,
+        correlation_matrix=correlation_matrix, rolling_volatility=rolling_volatility,
+        drawdowns=drawdowns, max_drawdowns=max_drawdowns
+    )
+
+
+portfolio = DeferredData(build_portfolio_data, name="portfolio")
+
+startup = StartupTimer()
+# compress=True: gzip/brotli responses via flask-compress (dash[compress])
+app = dash.Dash(__name__, compress=True)
 app.title = "Global Portfolio Dashboard"
+instrument_app(app)
+add_health_endpoint(app, portfolio)
 
 app.layout = html.Div(id='main-div', children=[
     html.H1("🌍 Global Market Portfolio Dashboard", id="title", style={"textAlign": "center", "fontSize": "32px"}),
@@ -72,7 +99,7 @@ app.layout = html.Div(id='main-div', children=[
 
     dcc.Tabs(id="tabs", value='overview', children=[
         dcc.Tab(label="📊 Overview", value='overview', children=[
-            html.Div([
+            dcc.Loading(html.Div([
                 html.H3("Actual Global Portfolio Allocation (Market Cap-Based)", style={"textAlign": "center"}),
                 dcc.Graph(id='pie-chart'),
 
@@ -80,23 +107,24 @@ app.layout = html.Div(id='main-div', children=[
                 html.Div(id='performance-table'),
 
                 dcc.Graph(id='cumulative-return-chart')
-            ])
+            ]))
         ]),
 
         dcc.Tab(label="📈 Risk & Correlation", value='risk', children=[
-            dcc.Graph(id='rolling-vol-chart'),
+            dcc.Loading(dcc.Graph(id='rolling-vol-chart')),
 
-            dcc.Graph(id='corr-matrix'),
+            dcc.Loading(dcc.Graph(id='corr-matrix')),
 
             html.Div([
                 html.H4("Drawdown Analysis"),
                 html.P("Select an asset class to view its historical drawdown."),
                 dcc.Dropdown(
                     id='drawdown-asset-selector',
-                    options=[{'label': col, 'value': col} for col in drawdowns.columns],
+                    # Same columns as the drawdowns frame, known before the data is loaded
+                    options=[{'label': col, 'value': col} for col in [*asset_classes, 'Global Portfolio']],
                     value='Global Portfolio'
                 ),
-                dcc.Graph(id='drawdown-chart')
+                dcc.Loading(dcc.Graph(id='drawdown-chart'))
             ], style={"padding": "0 10%"})
         ]),
 
@@ -111,11 +139,12 @@ app.layout = html.Div(id='main-div', children=[
                            tooltip={"placement": "bottom", "always_visible": True}),
                 html.Br(),
 
-                html.Div(id='etf-breakdown')
+                dcc.Loading(html.Div(id='etf-breakdown'))
             ], style={"padding": "0 10%"})
         ])
     ])
 ])
+startup.mark("layout")
 
 @app.callback(
     Output('main-div', 'style'),
@@ -134,6 +163,7 @@ def update_background(theme):
     Input('theme-toggle', 'value')
 )
 def update_pie_chart(theme):
+    import plotly.express as px
     fig = px.pie(
         names=list(asset_classes.keys()),
         values=[info['weight'] for info in asset_classes.values()],
@@ -149,20 +179,24 @@ def update_pie_chart(theme):
     Input('theme-toggle', 'value')
 )
 def update_cumulative_return(theme):
+    from compact_figures import compact_figure
+    import plotly.express as px
+    data = portfolio.get()
     fig = px.line(
-        cumulative_returns,
-        x=cumulative_returns.index,
-        y=cumulative_returns.columns,
+        data.cumulative_returns,
+        x=data.cumulative_returns.index,
+        y=data.cumulative_returns.columns,
         title="Cumulative Return Over Time"
     )
     fig.update_layout(title_x=0.5, legend_title_text="ETF", template='plotly_dark' if theme == 'dark' else 'plotly_white')
-    return fig
+    return compact_figure(fig)
 
 @app.callback(
     Output('performance-table', 'children'),
     Input('theme-toggle', 'value')
 )
 def update_performance_table(theme):
+    data = portfolio.get()
     style = {
         "width": "80%",
         "margin": "0 auto",
@@ -184,11 +218,11 @@ def update_performance_table(theme):
         html.Tbody([
             html.Tr([
                 html.Td(col),
-                html.Td(f"{annualized_return[col]:.2%}"),
-                html.Td(f"{annualized_volatility[col]:.2%}"),
-                html.Td(f"{sharpe_ratio[col]:.2f}"),
-                html.Td(f"{max_drawdowns[col]:.2%}")
-            ]) for col in cumulative_returns.columns
+                html.Td(f"{data.annualized_return[col]:.2%}"),
+                html.Td(f"{data.annualized_volatility[col]:.2%}"),
+                html.Td(f"{data.sharpe_ratio[col]:.2f}"),
+                html.Td(f"{data.max_drawdowns[col]:.2%}")
+            ]) for col in data.cumulative_returns.columns
         ])
     ], style=style)
 
@@ -197,20 +231,23 @@ def update_performance_table(theme):
     Input('theme-toggle', 'value')
 )
 def update_rolling_vol(theme):
+    from compact_figures import compact_figure
+    rolling_volatility = portfolio.get().rolling_volatility
     fig = go.Figure([
         go.Scatter(x=rolling_volatility.index, y=rolling_volatility[col], mode='lines', name=col)
         for col in rolling_volatility.columns
     ])
     fig.update_layout(title="90-Day Rolling Volatility (Annualized)", yaxis_title="Volatility",
                       template='plotly_dark' if theme == 'dark' else 'plotly_white', title_x=0.5)
-    return fig
+    return compact_figure(fig)
 
 @app.callback(
     Output('corr-matrix', 'figure'),
     Input('theme-toggle', 'value')
 )
 def update_corr_matrix(theme):
-    fig = px.imshow(correlation_matrix, text_auto=True, color_continuous_scale='Teal',
+    import plotly.express as px
+    fig = px.imshow(portfolio.get().correlation_matrix, text_auto=True, color_continuous_scale='Teal',
                     title="Correlation Matrix", aspect="auto")
     fig.update_layout(title_x=0.5, template='plotly_dark' if theme == 'dark' else 'plotly_white')
     return fig
@@ -221,11 +258,13 @@ def update_corr_matrix(theme):
     State('theme-toggle', 'value')
 )
 def update_drawdown_chart(asset, theme):
+    from compact_figures import compact_figure
+    drawdowns = portfolio.get().drawdowns
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=drawdowns.index, y=drawdowns[asset], mode='lines', name=asset))
     fig.update_layout(title=f"Drawdown Over Time: {asset}", yaxis_title="Drawdown",
                       template='plotly_dark' if theme == 'dark' else 'plotly_white', title_x=0.5)
-    return fig
+    return compact_figure(fig)
 
 @app.callback(
     Output('etf-breakdown', 'children'),
@@ -233,6 +272,7 @@ def update_drawdown_chart(asset, theme):
     State('theme-toggle', 'value')
 )
 def update_etf_allocation(amount, theme):
+    etf_info = portfolio.get().etf_info
     rows = []
     for asset, info in asset_classes.items():
         etf = etf_info.get(asset, {'ticker': '-', 'price': 1, 'return_5y': 0})
@@ -266,4 +306,6 @@ def update_etf_allocation(amount, theme):
     })
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # On the Procfile dyno PORT is set: bind it on all interfaces, without the reloader re-running the data build
+    port = os.environ.get('PORT')
+    app.run(debug=port is None, host='0.0.0.0' if port else '127.0.0.1', port=int(port or 8050))
@@ -0,0 +1,328 @@
+"""
+Offline benchmark suite for the dashboards.
+
+Runs against synthetic data only (see synthetic_data.py): yfinance and the
+companiesmarketcap request are replaced by local stand-ins, data files are
+generated into a temporary working directory. For every app it times the
+startup pipeline and every registered callback through the Flask test client,
+so serialization is included.
+
+Startup has two numbers. Cold start runs the app as its own `__main__` in a
+fresh process with PORT set, through a small bootstrap that installs the same
+offline stand-ins first, and measures the time until the page first answers,
+i.e. what a platform boot check waits for; it is taken once per target, on the
+first grid cell. Data ready is measured in-process: the time until every
+DeferredData loader has finished, with download/analytics/layout phases.
+Payload sizes are reported per callback with and without figure compaction
+(compact_figures.py) and per content encoding. Results are written as JSON.
+
+    python benchmark.py --years 5 10 --assets 20 200 --rows 1000 10000 --output bench.json
+
+The default grid includes 10 years so the payload report shows where gzip
+stops deduplicating the x arrays compact_figure repeats per trace.
+"""
+import argparse
+import importlib.machinery
+import importlib.util
+import itertools
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+import compact_figures
+from deferred import DeferredData
+from instrumentation import METRICS
+from synthetic_data import SECTORS, SyntheticMarket, offline, synthetic_etf_portfolio, synthetic_ipo_data
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Run an app as __main__ with the synthetic market installed; argv: repo dir, app path, years, seed
+COLD_START_BOOTSTRAP = """
+import runpy, sys
+repo_dir, path, years, seed = sys.argv[1:]
+sys.path.insert(0, repo_dir)
+from synthetic_data import SyntheticMarket, offline
+with offline(SyntheticMarket(years=int(years), seed=int(seed))):
+    runpy.run_path(path, run_name="__main__")
+"""
+
+# Which grid parameters each target depends on, and the values its callback inputs take
+APPS = {
+    "app.py": {
+        "params": ["years"],
+        "cold_start": True,
+        "inputs": {
+            "theme-toggle.value": "light",
+            "drawdown-asset-selector.value": "Global Portfolio",
+            "amount-slider.value": 10000,
+        },
+    },
+    "app2": {
+        "params": ["assets", "years"],
+        "cold_start": True,
+        "inputs": {
+            "theme-toggle.value": "light",
+            "drawdown-asset-selector.value": "Global Portfolio",
+            "amount-slider.value": 10000,
+        },
+    },
+    "Dashboard.py": {
+        "params": ["years"],
+        "cold_start": True,
+        "inputs": {},
+    },
+    "dash1.py": {
+        "params": [],
+        "inputs": {
+            "company-dropdown.value": ["IPO1", "IPO2"],
+            "category-checklist.value": ["Revenue", "Cost", "Stock Price"],
+            "download-btn.n_clicks": 1,
+        },
+    },
+    "dash2.py": {
+        "params": ["rows"],
+        "inputs": {
+            "dropdown-Sector.value": SECTORS[:3],
+            "dropdown-Company-Name.value": ["IPO00000", "IPO00001", "IPO00002"],
+        },
+    },
+}
+
+
+def _stats(samples_ms):
+    return {
+        "runs": len(samples_ms),
+        "min_ms": round(min(samples_ms), 3),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+
+def _timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, result
+
+
+_load_count = itertools.count()
+
+
+def load_module(filename):
+    """Import a repo script under a fresh name so its module-level startup runs again."""
+    name = f"bench_{os.path.splitext(filename)[0]}_{next(_load_count)}"
+    path = os.path.join(REPO_DIR, filename)
+    # app2 has no .py extension, so the loader has to be given explicitly
+    loader = importlib.machinery.SourceFileLoader(name, path)
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader(name, loader))
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def write_data_files(workdir, assets, rows, seed):
+    synthetic_etf_portfolio(assets, seed=seed).to_csv(os.path.join(workdir, "etf_portfolio_data.csv"), index=False)
+    synthetic_ipo_data(rows, seed=seed).to_csv(os.path.join(workdir, "FIEP Data set(Sheet1).csv"), index=False)
+
+
+def _split_output(output):
+    """'id.prop' -> {'id', 'property'}; multi-output '..a.p...b.q..' -> a list of those."""
+    if not output.startswith(".."):
+        return dict(zip(("id", "property"), output.rsplit(".", 1)))
+    return [_split_output(part) for part in output[2:-2].split("...")]
+
+
+def callback_requests(app, input_values):
+    """One /_dash-update-component body per registered callback."""
+    def with_values(deps):
+        return [dict(dep, value=input_values.get(f"{dep['id']}.{dep['property']}")) for dep in deps]
+
+    for output, spec in app.callback_map.items():
+        inputs = with_values(spec["inputs"])
+        yield output, {
+            "output": output,
+            "outputs": _split_output(output),
+            "inputs": inputs,
+            "state": with_values(spec["state"]),
+            "changedPropIds": [f"{dep['id']}.{dep['property']}" for dep in inputs],
+        }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cold_start_ttfb(filename, workdir, years, seed, timeout=120):
+    """Start the app offline in a new process and time until '/' first answers (ms)."""
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port))
+    url = f"http://127.0.0.1:{port}/"
+    args = [REPO_DIR, os.path.join(REPO_DIR, filename), str(years), str(seed)]
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", COLD_START_BOOTSTRAP, *args], cwd=workdir, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{filename} exited with code {proc.returncode} before serving")
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    response.read(1)
+                return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise TimeoutError(f"{filename} did not answer within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def start_app(filename):
+    """Load an app in-process and time until every DeferredData loader has finished (ms)."""
+    METRICS.reset()
+    start = time.perf_counter()
+    module = load_module(filename)
+    for loader in vars(module).values():
+        if isinstance(loader, DeferredData):
+            loader.get()
+    return module, module.app.server.test_client(), (time.perf_counter() - start) * 1000
+
+
+def payload_sizes(post):
+    """Response bytes for each encoding, with figure compaction off ('raw') and on ('compact')."""
+    enabled = compact_figures.ENABLED
+    sizes = {}
+    try:
+        for mode, compact in (("raw", False), ("compact", True)):
+            compact_figures.ENABLED = compact
+            sizes[mode] = {encoding: len(post({"Accept-Encoding": encoding}).get_data())
+                           for encoding in ("identity", "gzip", "br")}
+    finally:
+        compact_figures.ENABLED = enabled
+    return sizes
+
+
+def bench_app(filename, config, repeat, workdir, market, cold_start=False):
+    runs = [start_app(filename) for _ in range(repeat)]
+    module, client, _ = runs[-1]
+    result = {"startup": {"data_ready": _stats([ready_ms for _, _, ready_ms in runs]),
+                          "phases_ms": dict(METRICS.startup_ms)},
+              "callbacks": {}}
+    if cold_start:
+        result["startup"]["cold_start_ttfb"] = _stats(
+            [cold_start_ttfb(filename, workdir, market.years, market.seed) for _ in range(repeat)])
+
+    METRICS.reset()
+    posts = {}
+    for output, body in callback_requests(module.app, config["inputs"]):
+        def post(headers=None, body=body):
+            return client.post("/_dash-update-component", json=body, headers=headers)
+
+        samples, response = _timed(post, repeat)
+        result["callbacks"][output] = dict(_stats(samples), status=response.status_code)
+        posts[output] = post
+    # Per-function compute/serialize split as seen by the instrumentation layer. Taken
+    # before payload_sizes(), whose extra requests mix compaction modes and encodings.
+    result["callback_breakdown"] = {
+        name: {metric: hist["mean"] for metric, hist in hists.items()}
+        for name, hists in METRICS.snapshot()["callbacks"].items()
+    }
+
+    for output, post in posts.items():
+        result["callbacks"][output]["payload_bytes"] = payload_sizes(post)
+    METRICS.reset()
+    return result
+
+
+def bench_scraper(rows, seed, repeat):
+    market = SyntheticMarket(market_cap_rows=rows, seed=seed)
+    with offline(market):
+        scraper = load_module("scraper.py")
+        samples, df = _timed(scraper.fetch_market_cap_data, repeat)
+    return dict(_stats(samples), parsed_rows=len(df))
+
+
+def run(years, assets, rows, repeat, seed, only=None):
+    grid = {"years": years, "assets": assets, "rows": rows}
+    results = []
+    cwd = os.getcwd()
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            for filename, config in APPS.items():
+                if only and filename not in only:
+                    continue
+                names = config["params"]
+                for cell, values in enumerate(itertools.product(*(grid[name] for name in names))):
+                    params = dict(zip(names, values))
+                    write_data_files(workdir, params.get("assets", assets[0]), params.get("rows", rows[0]), seed)
+                    market = SyntheticMarket(years=params.get("years", years[0]), seed=seed)
+                    # Cold start is dominated by imports, not grid size: one measurement per target
+                    cold_start = config.get("cold_start", False) and cell == 0
+                    with offline(market):
+                        outcome = bench_app(filename, config, repeat, workdir, market, cold_start)
+                    results.append(dict(target=filename, params=params, **outcome))
+                    startup = outcome["startup"]
+                    ttfb = f"cold start ttfb {startup['cold_start_ttfb']['median_ms']:.1f} ms, " \
+                        if "cold_start_ttfb" in startup else ""
+                    print(f"{filename} {params}: {ttfb}data ready {startup['data_ready']['median_ms']:.1f} ms",
+                          file=sys.stderr)
+
+            if not only or "scraper.py" in only:
+                for n in rows:
+                    outcome = bench_scraper(n, seed, repeat)
+                    results.append({"target": "scraper.py", "params": {"rows": n}, "parse": outcome})
+                    print(f"scraper.py {{'rows': {n}}}: parse {outcome['median_ms']:.1f} ms", file=sys.stderr)
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "grid": grid,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the FIEP dashboards")
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 10], help="years of price history per asset")
+    parser.add_argument("--assets", type=int, nargs="+", default=[20], help="ETFs in app2's portfolio file")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000], help="IPO rows for dash2 / scraper table rows")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="targets to run, e.g. app.py scraper.py")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.years, args.assets, args.rows, args.repeat, args.seed, args.only)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import base64
+import os
+
+import numpy as np
+import pandas as pd
+
+# Set FIEP_COMPACT_FIGURES=0 to send figures exactly as plotly builds them (e.g. to compare payloads)
+ENABLED = os.environ.get("FIEP_COMPACT_FIGURES", "1") not in ("0", "false")
+
+COMPACT_KEYS = ("x", "y")
+
+
+def _typed_array(values, dtype):
+    """plotly.js typed-array spec: little-endian binary, base64 encoded."""
+    values = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {"dtype": dtype, "bdata": base64.b64encode(values.tobytes()).decode("ascii")}
+
+
+def _as_array(values):
+    if isinstance(values, dict) and "bdata" in values:
+        return np.frombuffer(base64.b64decode(values["bdata"]), dtype=values["dtype"])
+    return np.asarray(values)
+
+
+def _as_epoch_ms(values):
+    """Dates as float ms since epoch (what plotly.js uses internally for date axes), or None."""
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[ms]").astype(np.int64).astype(np.float64)
+    if values.dtype == object and len(values) and isinstance(values[0], pd.Timestamp):
+        # Wall-clock time, as plotly.js shows tz-aware dates; as_unit because the
+        # index resolution depends on the input (ns, or us for Timestamp objects)
+        return pd.DatetimeIndex(values).tz_localize(None).as_unit("ms").asi8.astype(np.float64)
+    return None
+
+
+def compact_figure(fig, decimals=4, dtype="f4"):
+    """
+    Shrink a figure before it is returned from a callback.
+
+    - numeric arrays are rounded to `decimals` and sent as base64 `dtype`
+      typed arrays instead of JSON float lists;
+    - datetime arrays are sent as one float64 typed array of epoch ms instead
+      of ISO strings, and the axis is pinned to type 'date';
+    - traces sharing the same x values reuse one encoded array, so it is only
+      encoded once per figure. The JSON still carries a copy per trace: brotli
+      removes the repeats, gzip only while a trace fits in its 32KB window
+      (about 5 years of daily dates); past that, gzip payloads grow per trace.
+
+    Returns a plain figure dict, which Dash accepts like a go.Figure.
+    """
+    if not ENABLED:
+        return fig
+    fig = fig.to_plotly_json() if hasattr(fig, "to_plotly_json") else dict(fig)
+    layout = dict(fig.get("layout", {}))
+    shared = {}
+    data = []
+
+    for trace in fig.get("data", []):
+        trace = dict(trace)
+        for key in COMPACT_KEYS:
+            if key not in trace or trace[key] is None:
+                continue
+            values = _as_array(trace[key])
+            if values.ndim != 1:
+                continue
+
+            epoch_ms = _as_epoch_ms(values)
+            if epoch_ms is not None:
+                encoded_key = ("date", epoch_ms.tobytes())
+                if encoded_key not in shared:
+                    shared[encoded_key] = _typed_array(epoch_ms, "f8")
+                axis = key + "axis" + trace.get(key + "axis", key)[1:]
+                layout[axis] = {**layout.get(axis, {}), "type": "date"}
+            elif values.dtype.kind in "fiu":
+                values = np.round(values.astype(np.float64), decimals)
+                encoded_key = (dtype, values.tobytes())
+                if encoded_key not in shared:
+                    shared[encoded_key] = _typed_array(values, dtype)
+            else:
+                continue
+            trace[key] = shared[encoded_key]
+        data.append(trace)
+
+    return {**fig, "data": data, "layout": layout}
+
+
+if __name__ == "__main__":
+    # Round-trip check: dates and values must decode back to what was plotted
+    import plotly.graph_objects as go
+
+    for tz in (None, "US/Eastern"):
+        index = pd.date_range("2021-03-01", periods=500, freq="B", tz=tz)
+        values = np.linspace(0.5, 1.5, len(index))
+        trace = compact_figure(go.Figure([go.Scatter(x=index, y=values)]))["data"][0]
+
+        decoded_x = pd.to_datetime(_as_array(trace["x"]), unit="ms")
+        assert (decoded_x == index.tz_localize(None)).all(), (tz, decoded_x[:3])
+        assert np.allclose(_as_array(trace["y"]), values, atol=1e-4), tz
+        print(f"tz={tz}: {decoded_x[0]} .. {decoded_x[-1]} OK")
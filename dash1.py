@@ -6,8 +6,12 @@ from io import BytesIO
 import base64
 import webbrowser
 import threading
+from instrumentation import StartupTimer, instrument_app
+
+startup = StartupTimer()
 
 app = dash.Dash("Chart")
+instrument_app(app)
 
 # Dữ liệu mẫu nhiều công ty, nhiều category
 data = pd.DataFrame({
@@ -20,6 +24,7 @@ data = pd.DataFrame({
 
 companies = data['Company'].unique()
 categories = ['Revenue', 'Cost', 'Stock Price']
+startup.mark("load_data")
 
 app.layout = html.Div([
     html.H2("Dashboard IPO NASDAQ"),
@@ -45,6 +50,7 @@ app.layout = html.Div([
 
     dcc.Graph(id='dashboard-chart')
 ])
+startup.mark("layout")
 
 @app.callback(
     Output('dashboard-chart', 'figure'),
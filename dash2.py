@@ -2,11 +2,15 @@ from dash import Dash, dcc, html, Input, Output
 import pandas as pd
 import plotly.express as px
 import dash_bootstrap_components as dbc
+from instrumentation import StartupTimer, instrument_app
+
+startup = StartupTimer()
 
 # Load data and process revenue
 df = pd.read_csv("FIEP Data set(Sheet1).csv")  # Adjust path if needed
 df['Revenue'] = pd.to_numeric(df['Revenue'].astype(str).str.replace(',', ''), errors='coerce')
 df.dropna(subset=['Revenue', 'Sector', 'Symbol', 'Company'], inplace=True)
+startup.mark("load_csv")
 
 def categorize_revenue(value):
     if value < 1_000_000:
@@ -19,11 +23,13 @@ def categorize_revenue(value):
         return "100M+"
 
 df['Revenue Category'] = df['Revenue'].apply(categorize_revenue)
+startup.mark("analytics")
 
 # Categories for filtering chart
 filter_categories = ['Sector', 'Revenue Category']
 
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+instrument_app(app)
 
 # Create dropdowns for Sector and Revenue Category (multi-select)
 filter_dropdowns = []
@@ -84,6 +90,7 @@ app.layout = dbc.Container([
         ], width=9, style={"padding": "20px"})
     ])
 ], fluid=True, style={"fontFamily": "'Montserrat', sans-serif"})
+startup.mark("layout")
 
 
 @app.callback(
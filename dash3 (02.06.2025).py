@@ -1,24 +1,16 @@
 # === Step 1: Install Required Packages ===
-# pip install dash pandas
+# pip install dash pandas numpy
 
 # === Step 2: Create a file: app.py ===
 import dash
 from dash import dcc, html, Input, Output, State
-import pandas as pd
-
-# === Step 3: Sample ETF Dataset (replace this with real data or database connection) ===
-etf_data = pd.DataFrame([
-    {"Sector": "Technology", "ETF": "EXV3.DE", "Name": "iShares STOXX Europe 600 Technology", "Price": 340.50},
-    {"Sector": "Healthcare", "ETF": "HEAL.L", "Name": "iShares Healthcare Innovation UCITS", "Price": 65.30},
-    {"Sector": "Financials", "ETF": "BNKE.PA", "Name": "Lyxor Euro Stoxx Banks", "Price": 23.10},
-    {"Sector": "Consumer Goods", "ETF": "XCGD.DE", "Name": "Xtrackers Consumer Discretionary", "Price": 89.90},
-    {"Sector": "Energy", "ETF": "IESU.L", "Name": "iShares MSCI Europe Energy", "Price": 34.60},
-    {"Sector": "Utilities", "ETF": "UTIL.DE", "Name": "SPDR MSCI Europe Utilities", "Price": 77.20},
-    {"Sector": "Real Estate", "ETF": "IPRP.L", "Name": "iShares European Property Yield", "Price": 42.75},
-    {"Sector": "Industrials", "ETF": "XIND.DE", "Name": "Xtrackers MSCI Europe Industrials", "Price": 51.30},
-    {"Sector": "Materials", "ETF": "XMAT.DE", "Name": "iShares MSCI Europe Materials", "Price": 68.90},
-    {"Sector": "Telecommunications", "ETF": "TELE.PA", "Name": "Lyxor STOXX Europe 600 Telecom", "Price": 27.45},
-])
+from etf_screener import ETFScreener, load_etf_universe
+
+# === Step 3: ETF universe (add more CSV exports here; columns are normalised on load) ===
+ETF_UNIVERSE_FILES = ["etf_data.csv", "data_app2.csv"]
+PAGE_SIZE = 20
+
+screener = ETFScreener(load_etf_universe(ETF_UNIVERSE_FILES))
 
 # === Step 4: Build Dash App ===
 app = dash.Dash(__name__)
@@ -27,13 +19,34 @@ server = app.server
 app.layout = html.Div([
     html.H2("💼 ETF Recommendation Tool (EUR-based Investors)"),
 
-    html.Label("Step 1: Select sectors you're interested in:"),
+    html.Label("Step 1: Select sectors and/or asset classes you're interested in:"),
     dcc.Dropdown(
         id='sector-dropdown',
-        options=[{'label': s, 'value': s} for s in etf_data['Sector'].unique()],
+        options=[{'label': s, 'value': s} for s in screener.categories('sector')],
         multi=True,
         placeholder="Select sectors...",
     ),
+    dcc.Dropdown(
+        id='asset-class-dropdown',
+        options=[{'label': a, 'value': a} for a in screener.categories('asset_class')],
+        multi=True,
+        placeholder="Select asset classes...",
+    ),
+
+    html.Br(),
+    html.Label("Optional: narrow down by region and provider:"),
+    dcc.Dropdown(
+        id='region-dropdown',
+        options=[{'label': r, 'value': r} for r in screener.categories('region')],
+        multi=True,
+        placeholder="Any region",
+    ),
+    dcc.Dropdown(
+        id='provider-dropdown',
+        options=[{'label': p, 'value': p} for p in screener.categories('provider')],
+        multi=True,
+        placeholder="Any provider",
+    ),
 
     html.Br(),
     html.Label("Step 2: Enter your investment budget (EUR):"),
@@ -45,8 +58,20 @@ app.layout = html.Div([
         step=50
     ),
 
+    html.Br(),
+    html.Label("Maximum TER (%):"),
+    dcc.Input(
+        id='ter-input',
+        type='number',
+        placeholder="e.g. 0.25",
+        min=0,
+        step=0.05
+    ),
+
     html.Br(), html.Br(),
     html.Button('🎯 Get ETF Suggestions', id='suggest-button', n_clicks=0),
+    html.Label(" Page: "),
+    dcc.Input(id='page-input', type='number', value=1, min=1, step=1),
 
     html.Hr(),
     html.Div(id='etf-suggestion-output', style={'whiteSpace': 'pre-line'})
@@ -55,24 +80,40 @@ app.layout = html.Div([
 @app.callback(
     Output('etf-suggestion-output', 'children'),
     Input('suggest-button', 'n_clicks'),
+    Input('page-input', 'value'),
     State('sector-dropdown', 'value'),
-    State('budget-input', 'value')
+    State('asset-class-dropdown', 'value'),
+    State('region-dropdown', 'value'),
+    State('provider-dropdown', 'value'),
+    State('budget-input', 'value'),
+    State('ter-input', 'value')
 )
-def suggest_etfs(n_clicks, selected_sectors, budget):
-    if not n_clicks or not selected_sectors or budget is None:
-        return "⚠️ Please select sectors and enter your budget."
+def suggest_etfs(n_clicks, page, selected_sectors, selected_asset_classes, selected_regions, selected_providers,
+                 budget, max_ter):
+    if not n_clicks or not (selected_sectors or selected_asset_classes) or budget is None:
+        return "⚠️ Please select sectors or asset classes and enter your budget."
 
-    filtered = etf_data[(etf_data['Sector'].isin(selected_sectors)) & (etf_data['Price'] <= budget)]
+    # Cheapest TER first, so the best-value funds land on page 1. Funds without a
+    # price in the source files are kept (shown as "price n/a") rather than dropped.
+    result = screener.query(
+        sectors=selected_sectors, asset_classes=selected_asset_classes,
+        regions=selected_regions, providers=selected_providers,
+        max_price=budget, max_ter=max_ter, include_unknown_price=True,
+        sort_by='ter', page=page, page_size=PAGE_SIZE
+    )
 
-    if filtered.empty:
-        return "🚫 No ETFs found matching your budget and selected sectors."
+    if not result['total']:
+        return "🚫 No ETFs found matching your budget and selected sectors/asset classes."
 
-    result = f"🔍 ETFs matching your preferences (<= €{budget:.2f}):\n\n"
-    for _, row in filtered.iterrows():
-        result += f"- {row['Name']} ({row['ETF']}) — €{row['Price']:.2f}\n"
-    return result
+    lines = [
+        f"🔍 {result['total']} ETFs matching your preferences (<= €{budget:.2f}) "
+        f"— page {result['page']} of {result['pages']}:\n"
+    ]
+    for row in result['rows'].itertuples(index=False):
+        ter = f", TER {row.ter:.2f}%" if row.ter == row.ter else ""
+        price = f"€{row.price:.2f}" if row.price == row.price else "price n/a"
+        lines.append(f"- {row.name} ({row.ticker}) — {price}{ter}")
+    return "\n".join(lines)
 
 if __name__ == '__main__':
     app.run(debug=True, port=8050)
-
-
@@ -0,0 +1,63 @@
+import json
+import threading
+import traceback
+
+from flask import Response
+
+
+class DeferredData:
+    """
+    Runs a data-building function in a background thread as soon as it is
+    created, so the web server can bind its port and serve the page while
+    downloads and analytics are still running.
+
+    Callbacks call get(), which blocks until the data is ready (the front end
+    shows a loading spinner meanwhile) and re-raises any error from the build.
+    """
+
+    def __init__(self, build, name="data"):
+        self.name = name
+        self._build = build
+        self._value = None
+        self._error = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"deferred-{name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._value = self._build()
+        except Exception as e:
+            traceback.print_exc()
+            self._error = e
+        finally:
+            self._done.set()
+
+    @property
+    def status(self):
+        if not self._done.is_set():
+            return "loading"
+        return "error" if self._error is not None else "ready"
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def get(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{self.name} is still loading")
+        if self._error is not None:
+            raise RuntimeError(f"Building {self.name} failed") from self._error
+        return self._value
+
+
+def add_health_endpoint(app, *deferred, path="/health"):
+    """
+    Liveness endpoint that answers immediately, before any data is loaded.
+    Always 200 while the process is up; the body reports each loader's status.
+    """
+    @app.server.route(path)
+    def _health():
+        body = {"status": "ok", "data": {d.name: d.status for d in deferred}}
+        return Response(json.dumps(body), mimetype="application/json")
+
+    return app
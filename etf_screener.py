@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+# Columns every ETF universe is normalised to, whatever file it came from
+# sector (GICS, data_app2.csv) and asset_class (etf_data.csv) are separate taxonomies
+UNIVERSE_COLUMNS = ["ticker", "name", "sector", "asset_class", "region", "provider", "isin", "price", "ter", "return_5y"]
+CATEGORY_FIELDS = ["sector", "asset_class", "region", "provider"]
+RANGE_FIELDS = ["price", "ter"]
+RANK_FIELDS = RANGE_FIELDS + ["return_5y"]
+
+# Source column names (etf_data.csv, data_app2.csv, dash3 sample) -> universe column
+_COLUMN_ALIASES = {
+    "ticker": "ticker", "etf": "ticker",
+    "name": "name", "etf_name": "name",
+    "sector": "sector",
+    "asset class": "asset_class", "asset_class": "asset_class",
+    "region": "region",
+    "provider": "provider",
+    "isin": "isin",
+    "price": "price",
+    "ter": "ter",
+    "return_5y": "return_5y",
+}
+
+
+def _parse_percent(series):
+    """'0.25%' -> 0.25 (TER is kept in percent, as displayed)."""
+    cleaned = series.astype(str).str.replace("%", "", regex=False).str.replace(",", ".", regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def normalize_etf_frame(df):
+    """Rename a raw ETF table to the universe schema and fix dtypes."""
+    df = df.rename(columns=lambda c: _COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+    df = df.loc[:, ~df.columns.duplicated()]
+    for col in UNIVERSE_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+    df = df[UNIVERSE_COLUMNS].copy()
+
+    df["ter"] = _parse_percent(df["ter"])
+    df["price"] = pd.to_numeric(df["price"], errors="coerce")
+    df["return_5y"] = pd.to_numeric(df["return_5y"], errors="coerce")
+    for col in ["ticker", "name", "isin"] + CATEGORY_FIELDS:
+        df[col] = df[col].fillna("").astype(str).str.strip()
+    return df[df["ticker"] != ""]
+
+
+def load_etf_universe(paths):
+    """Load and merge ETF files; rows sharing a ticker are merged column by column."""
+    frames = []
+    for path in paths:
+        try:
+            frames.append(normalize_etf_frame(pd.read_csv(path)))
+        except FileNotFoundError:
+            print(f"ETF file not found, skipping: {path}")
+    if not frames:
+        return pd.DataFrame(columns=UNIVERSE_COLUMNS)
+
+    universe = pd.concat(frames, ignore_index=True)
+    # Empty strings would win over real values in first(), so treat them as missing while merging
+    universe = universe.replace("", np.nan).groupby("ticker", sort=False, as_index=False).first()
+    for col in ["name", "isin"] + CATEGORY_FIELDS:
+        universe[col] = universe[col].fillna("")
+    return universe[UNIVERSE_COLUMNS]
+
+
+class ETFScreener:
+    """
+    Filter/rank engine over an ETF universe.
+
+    All indexes are built once in the constructor so a query never scans the
+    frame: price/TER ranges are two binary searches over pre-sorted values,
+    sector/asset class/region/provider filters are ORs/ANDs of precomputed bitmaps, and
+    ranking only partially sorts the rows needed for the requested page.
+    """
+
+    def __init__(self, universe):
+        self.df = universe.reset_index(drop=True)
+        self.size = len(self.df)
+
+        # Numeric sort keys for every rankable column (NaN = missing)
+        self._keys = {field: self.df[field].to_numpy(dtype=float) for field in RANK_FIELDS}
+
+        # Range indexes: row ids ordered by value, plus the sorted values. NaN sorts
+        # last, so valid rows are the first `count` entries; the rest are kept as a bitmap.
+        self._ranges = {}
+        self._missing = {}
+        for field in RANGE_FIELDS:
+            values = self._keys[field]
+            order = np.argsort(values, kind="stable")
+            self._missing[field] = np.isnan(values)
+            count = int(np.count_nonzero(~self._missing[field]))
+            self._ranges[field] = (order[:count], values[order[:count]])
+
+        # Categorical bitmaps: one boolean mask per distinct value
+        self._bitmaps = {}
+        for field in CATEGORY_FIELDS:
+            codes, labels = pd.factorize(self.df[field], sort=True)
+            bitmaps = {}
+            for code, label in enumerate(labels):
+                if label:
+                    bitmaps[label] = codes == code
+            self._bitmaps[field] = bitmaps
+
+    def categories(self, field):
+        return sorted(self._bitmaps[field])
+
+    def _category_mask(self, field, selected):
+        mask = np.zeros(self.size, dtype=bool)
+        bitmaps = self._bitmaps[field]
+        for value in selected:
+            if value in bitmaps:
+                mask |= bitmaps[value]
+        return mask
+
+    def _range_mask(self, field, low, high, include_missing=False):
+        order, sorted_values = self._ranges[field]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        stop = len(sorted_values) if high is None else np.searchsorted(sorted_values, high, side="right")
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[start:stop]] = True
+        if include_missing:
+            mask |= self._missing[field]
+        return mask
+
+    def match(self, sectors=None, asset_classes=None, regions=None, providers=None,
+              min_price=None, max_price=None, min_ter=None, max_ter=None, include_unknown_price=False):
+        """
+        Boolean mask of rows passing every given filter (None/empty = no filter).
+        Rows without a price only pass a price filter if include_unknown_price is set.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for field, selected in (("sector", sectors), ("asset_class", asset_classes),
+                                ("region", regions), ("provider", providers)):
+            if selected:
+                mask &= self._category_mask(field, selected)
+        for field, low, high, include_missing in (("price", min_price, max_price, include_unknown_price),
+                                                  ("ter", min_ter, max_ter, False)):
+            if low is not None or high is not None:
+                mask &= self._range_mask(field, low, high, include_missing)
+        return mask
+
+    def _rank(self, row_ids, sort_by, ascending, k):
+        """Return the first k of row_ids ordered by sort_by; missing values go last."""
+        if sort_by not in self._keys:
+            raise ValueError(f"Cannot sort by {sort_by!r}; expected one of {RANK_FIELDS}")
+        keys = self._keys[sort_by][row_ids]
+        if not ascending:
+            keys = -keys
+        keys = np.where(np.isnan(keys), np.inf, keys)
+
+        if k < len(row_ids):
+            # Partial sort: only rows up to the k-th key (ties included) are fully ordered
+            kth = np.partition(keys, k - 1)[k - 1]
+            candidates = np.flatnonzero(keys <= kth)
+            row_ids, keys = row_ids[candidates], keys[candidates]
+        # Ties keep file order so pages are stable between queries
+        return row_ids[np.lexsort((row_ids, keys))][:k]
+
+    def query(self, sort_by="ter", ascending=True, page=1, page_size=20, **filters):
+        """
+        Screen the universe and return one page of ranked results.
+
+        Returns a dict with the page rows as a DataFrame plus the total match
+        count, so callers can render "page x of y" without another query.
+        """
+        page_size = max(int(page_size), 1)
+        row_ids = np.flatnonzero(self.match(**filters))
+        total = len(row_ids)
+        pages = max((total + page_size - 1) // page_size, 1)
+        page = min(max(int(page or 1), 1), pages)
+
+        start = (page - 1) * page_size
+        ranked = self._rank(row_ids, sort_by, ascending, start + page_size) if total else row_ids
+        return {
+            "rows": self.df.iloc[ranked[start:start + page_size]],
+            "total": total,
+            "page": page,
+            "pages": pages,
+            "page_size": page_size,
+        }
+
+
+if __name__ == "__main__":
+    screener = ETFScreener(load_etf_universe(["etf_data.csv", "data_app2.csv"]))
+    result = screener.query(max_price=100)
+    print(f"{result['total']} ETFs match, page {result['page']}/{result['pages']}")
+    print(result["rows"])
@@ -0,0 +1,285 @@
+import bisect
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import Response, g, has_request_context, request
+
+# Histogram bucket upper bounds
+TIME_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+SIZE_BUCKETS_BYTES = [1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000, 10_000_000]
+
+# Set FIEP_PROFILER=1 to start the sampling profiler with the app (e.g. on the Procfile dyno)
+PROFILER_ENV_VAR = "FIEP_PROFILER"
+PROFILER_INTERVAL_ENV_VAR = "FIEP_PROFILER_INTERVAL_MS"
+
+
+class Histogram:
+    """Fixed-bucket histogram; cheap enough to update on every request."""
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": round(self.total, 3),
+                "mean": round(self.total / self.count, 3) if self.count else 0.0,
+                "max": round(self.max, 3),
+                "p50": round(self.quantile(0.5), 3),
+                "p95": round(self.quantile(0.95), 3),
+                "buckets": {str(b): n for b, n in zip(self.buckets + ["+Inf"], self.counts)},
+            }
+
+
+class Metrics:
+    """Process-wide registry of startup phase timings and per-callback histograms."""
+
+    def __init__(self):
+        self.startup_ms = {}
+        self.callbacks = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.startup_ms = {}
+            self.callbacks = {}
+
+    def record_phase(self, name, elapsed_ms):
+        with self._lock:
+            self.startup_ms[name] = round(self.startup_ms.get(name, 0.0) + elapsed_ms, 3)
+
+    def _callback(self, name):
+        with self._lock:
+            if name not in self.callbacks:
+                self.callbacks[name] = {
+                    "compute_ms": Histogram(TIME_BUCKETS_MS),
+                    "serialize_ms": Histogram(TIME_BUCKETS_MS),
+                    "wall_ms": Histogram(TIME_BUCKETS_MS),
+                    "payload_bytes": Histogram(SIZE_BUCKETS_BYTES),
+                    "wire_bytes": Histogram(SIZE_BUCKETS_BYTES),
+                }
+            return self.callbacks[name]
+
+    def observe(self, name, metric, value):
+        self._callback(name)[metric].observe(value)
+
+    def snapshot(self):
+        # Copy under the lock: request threads may add callbacks while /metrics is scraped
+        with self._lock:
+            startup_ms = dict(self.startup_ms)
+            callbacks = list(self.callbacks.items())
+        return {
+            "startup_ms": startup_ms,
+            "callbacks": {
+                name: {metric: hist.snapshot() for metric, hist in hists.items()}
+                for name, hists in callbacks
+            },
+        }
+
+
+METRICS = Metrics()
+
+
+class StartupTimer:
+    """
+    Records startup phases into METRICS: each mark() stores the time elapsed
+    since the previous mark under the given phase name.
+
+        startup = StartupTimer()
+        ...download...
+        startup.mark("download")
+    """
+
+    def __init__(self):
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        METRICS.record_phase(phase, (now - self._last) * 1000)
+        self._last = now
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler for production use.
+
+    A daemon thread periodically grabs the stack of every other thread and
+    counts collapsed stacks ("file:func;file:func;..."), so hot paths show up
+    without instrumenting any code. Output is compatible with flamegraph tools.
+    """
+
+    def __init__(self, interval_ms=10, max_depth=40):
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self.samples = Counter()
+        self.sample_count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stacks.append(";".join(reversed(stack)))
+            with self._lock:
+                self.samples.update(stacks)
+                self.sample_count += 1
+
+    def _copy(self):
+        # New stacks are added while /metrics/profile is served; sort and format a copy
+        with self._lock:
+            return Counter(self.samples)
+
+    def top(self, n=50):
+        return [{"stack": stack, "samples": count} for stack, count in self._copy().most_common(n)]
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self._copy().items())
+
+
+def _wrap_callback(func):
+    name = func.__name__
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            METRICS.observe(name, "compute_ms", (end - start) * 1000)
+            # Dash serializes the return value right after this; after_request measures from here
+            if has_request_context():
+                g.fiep_callback = name
+                g.fiep_callback_end = end
+
+    return timed
+
+
+def instrument_app(app, metrics_path="/metrics", profile=None):
+    """
+    Instrument a Dash app. Call right after creating the app, before any
+    @app.callback, so that every callback registered afterwards is timed.
+
+    Per callback it records compute time (the function itself), serialization
+    time (function return -> response ready, i.e. JSON encoding of figures),
+    total wall time of the request and two response sizes: payload_bytes is
+    the JSON body Dash produced, wire_bytes what was actually sent after
+    gzip/brotli (the same as payload_bytes without compress=True). Metrics are
+    served as JSON on `metrics_path`; the sampling profiler is enabled with
+    profile=True or the FIEP_PROFILER environment variable and served on
+    `<metrics_path>/profile`.
+    """
+    register = app.callback
+
+    @functools.wraps(register)
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+        return lambda func: decorator(_wrap_callback(func))
+
+    app.callback = callback
+
+    server = app.server
+
+    @server.before_request
+    def _start_timer():
+        g.fiep_request_start = time.perf_counter()
+
+    @server.after_request
+    def _record_callback(response):
+        name = g.get("fiep_callback")
+        if name is not None and request.path.endswith("_dash-update-component"):
+            now = time.perf_counter()
+            METRICS.observe(name, "serialize_ms", (now - g.fiep_callback_end) * 1000)
+            METRICS.observe(name, "wall_ms", (now - g.fiep_request_start) * 1000)
+            METRICS.observe(name, "payload_bytes", response.calculate_content_length() or 0)
+        return response
+
+    def _record_wire_size(response):
+        name = g.get("fiep_callback")
+        if name is not None and request.path.endswith("_dash-update-component"):
+            METRICS.observe(name, "wire_bytes", response.calculate_content_length() or 0)
+        return response
+
+    # after_request hooks run in reverse registration order and flask-compress registered
+    # its hook when the Dash app was created; putting this one first makes it run last,
+    # after compression, so it sees the bytes that go out.
+    server.after_request_funcs.setdefault(None, []).insert(0, _record_wire_size)
+
+    if profile is None:
+        profile = os.environ.get(PROFILER_ENV_VAR, "") not in ("", "0", "false")
+    profiler = None
+    if profile:
+        interval_ms = float(os.environ.get(PROFILER_INTERVAL_ENV_VAR, 10))
+        profiler = SamplingProfiler(interval_ms=interval_ms).start()
+
+    @server.route(metrics_path)
+    def _metrics():
+        data = METRICS.snapshot()
+        data["profiler"] = {"enabled": profiler is not None,
+                            "samples": profiler.sample_count if profiler else 0}
+        return Response(json.dumps(data), mimetype="application/json")
+
+    @server.route(metrics_path + "/profile")
+    def _profile():
+        if profiler is None:
+            return Response(f"Profiler disabled; set {PROFILER_ENV_VAR}=1", status=404, mimetype="text/plain")
+        if request.args.get("format") == "collapsed":
+            return Response(profiler.collapsed(), mimetype="text/plain")
+        return Response(json.dumps({"samples": profiler.sample_count, "top": profiler.top()}),
+                        mimetype="application/json")
+
+    app.profiler = profiler
+    return app
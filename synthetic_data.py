@@ -0,0 +1,148 @@
+"""
+Deterministic synthetic market data and offline stand-ins for the network
+calls the dashboards make (yf.download and the companiesmarketcap request).
+
+Everything is seeded, so two runs with the same parameters produce identical
+frames and benchmark numbers stay comparable between commits.
+"""
+import sys
+import types
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+# Fixed "today" for every generator, so the date axis does not move between runs
+AS_OF = pd.Timestamp("2025-05-14")
+SECTORS = ["Technology", "Financial Services", "Healthcare", "Industrials", "Consumer Cyclical",
+           "Energy", "Real Estate", "Utilities", "Basic Materials", "Communication Services"]
+
+
+def _rng(seed, key=""):
+    # crc32 instead of hash(): str hashes are salted per process
+    return np.random.default_rng([seed, zlib.crc32(key.encode())])
+
+
+def synthetic_prices(ticker, years=5, seed=0, end=None):
+    """OHLCV frame for one ticker: geometric Brownian motion over business days."""
+    end = AS_OF if end is None else pd.Timestamp(end).normalize()
+    index = pd.bdate_range(end=end, periods=int(years * TRADING_DAYS), name="Date")
+    rng = _rng(seed, ticker)
+
+    drift = rng.uniform(-0.02, 0.12) / TRADING_DAYS
+    vol = rng.uniform(0.05, 0.45) / np.sqrt(TRADING_DAYS)
+    close = rng.uniform(10, 400) * np.exp(np.cumsum(rng.normal(drift, vol, len(index))))
+    spread = np.abs(rng.normal(0, vol, len(index))) * close
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.25, len(index)) * spread,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(10_000, 5_000_000, len(index)),
+    }, index=index)
+
+
+def synthetic_etf_portfolio(assets=20, seed=0):
+    """ETF table in the etf_portfolio_data.csv / data_app2.csv layout, weights summing to 1."""
+    rng = _rng(seed, "etf_portfolio")
+    weights = rng.dirichlet(np.ones(assets))
+    return pd.DataFrame({
+        "sector": [f"{SECTORS[i % len(SECTORS)]} {i}" for i in range(assets)],
+        "etf_name": [f"Synthetic UCITS ETF {i}" for i in range(assets)],
+        "ticker": [f"SYN{i:04d}" for i in range(assets)],
+        "price": rng.uniform(10, 400, assets).round(2),
+        "return_5y": rng.uniform(-0.2, 1.5, assets).round(2),
+        "weight": weights.round(6),
+        "isin": [f"IE00SYN{i:05d}" for i in range(assets)],
+        "ter": [f"{t:.2f}%" for t in rng.uniform(0.03, 0.9, assets)],
+    })
+
+
+def synthetic_ipo_data(rows=1000, seed=0):
+    """IPO table in the 'FIEP Data set(Sheet1).csv' layout, including its comma decimals and #VALUE! cells."""
+    rng = _rng(seed, "ipo")
+    offer = rng.uniform(4, 60, rows)
+    current = offer * rng.lognormal(0, 0.3, rows)
+    revenue = rng.lognormal(15, 2.5, rows).astype(np.int64)
+    revenue[rng.random(rows) < 0.1] = 0
+    dates = AS_OF - pd.to_timedelta(rng.integers(0, 365 * 3, rows), unit="D")
+    industries = [f"Industry {i}" for i in rng.integers(0, 40, rows)]
+    return pd.DataFrame({
+        "Symbol": [f"IPO{i:05d}" for i in range(rows)],
+        "Company": [f"Synthetic Holdings {i} Inc." for i in range(rows)],
+        "IPO Date": [f"{d.month}/{d.day}/{d.year}" for d in dates],
+        "Offer Price": [f"{v:.2f}".replace(".", ",") for v in offer],
+        "Current Price": [f"{v:.2f}".replace(".", ",") for v in current],
+        "Shares": rng.integers(1_000_000, 50_000_000, rows).astype(float),
+        "Revenue": revenue,
+        "Market Cap": "#VALUE!",
+        "Sector": rng.choice(SECTORS, rows),
+        "Industry": industries,
+        "Price Change %": "#VALUE!",
+        "Price/Sales": "#VALUE!",
+    })
+
+
+def synthetic_market_cap_html(rows=500, seed=0):
+    """Page shaped like companiesmarketcap.com/assets-by-market-cap/ (rank, name, '$1,234B')."""
+    rng = _rng(seed, "market_cap")
+    caps = np.sort(rng.lognormal(5, 1.5, rows))[::-1]
+    body = "".join(
+        f"<tr><td>{i + 1}</td><td>Asset {i}</td><td>${cap:,.2f}B</td><td>+0.1%</td></tr>"
+        for i, cap in enumerate(caps)
+    )
+    return ("<html><body><table><tr><th>Rank</th><th>Name</th><th>Market Cap</th><th>Today</th></tr>"
+            f"{body}</table></body></html>")
+
+
+class SyntheticMarket:
+    """
+    Offline replacement for yfinance and the scraper's HTTP call.
+
+    `years` controls how much history download() returns regardless of the
+    requested start/end, so the apps' hard-coded 5-year window can be scaled.
+    """
+
+    def __init__(self, years=5, market_cap_rows=500, seed=0):
+        self.years = years
+        self.market_cap_rows = market_cap_rows
+        self.seed = seed
+        self.calls = []
+
+    def download(self, tickers, start=None, end=None, **kwargs):
+        self.calls.append(tickers)
+        return synthetic_prices(tickers, years=self.years, seed=self.seed)
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append(url)
+        response = types.SimpleNamespace(status_code=200, url=url)
+        response.text = synthetic_market_cap_html(self.market_cap_rows, seed=self.seed)
+        return response
+
+    def yfinance_module(self):
+        module = types.ModuleType("yfinance")
+        module.download = self.download
+        return module
+
+    def requests_module(self):
+        module = types.ModuleType("requests")
+        module.get = self.get
+        return module
+
+
+@contextmanager
+def offline(market):
+    """Route `import yfinance` / `import requests` to the synthetic market while active."""
+    stubbed = {"yfinance": market.yfinance_module(), "requests": market.requests_module()}
+    saved = {name: sys.modules.get(name) for name in stubbed}
+    sys.modules.update(stubbed)
+    try:
+        yield market
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module